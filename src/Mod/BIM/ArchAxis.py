@@ -33,7 +33,10 @@ __url__    = "https://www.freecad.org"
 #  This module provides tools to build axis
 #  An axis is a collection of planar axes with a number/tag
 
-import math
+import functools
+from itertools import islice, zip_longest
+
+import numpy as np
 
 import FreeCAD
 import ArchCommands
@@ -44,7 +47,6 @@ from FreeCAD import Vector
 from draftutils import params
 
 if FreeCAD.GuiUp:
-    import re
     from pivy import coin
     from PySide import QtCore, QtGui
     from PySide.QtCore import QT_TRANSLATE_NOOP
@@ -59,6 +61,96 @@ else:
     # \endcond
 
 
+def _alpha_number(num):
+
+    "returns the letter tag of the given axis index: a, b, c..."
+
+    chars = "abcdefghijklmnopqrstuvwxyz"
+    base, remainder = divmod(num, 26)
+    return chars[base] + chars[remainder] if base else chars[remainder]
+
+
+@functools.lru_cache(maxsize=None)
+def _roman_number(num):
+
+    "returns the roman numeral of the given axis index: I, II, III..."
+
+    roman=(('M',1000),('CM',900),('D',500),('CD',400),
+           ('C',100),('XC',90),('L',50),('XL',40),
+           ('X',10),('IX',9),('V',5),('IV',4),('I',1))
+    result = ""
+    n = num + 1
+    for numeral, integer in roman:
+        while n >= integer:
+            result += numeral
+            n -= integer
+    return result
+
+
+# the bubble numbering styles, each turning an axis index into a bubble text
+_NUMBERING = {
+    "1,2,3": lambda num: str(num+1),
+    "01,02,03": lambda num: str(num+1).zfill(2),
+    "001,002,003": lambda num: str(num+1).zfill(3),
+    "A,B,C": lambda num: _alpha_number(num).upper(),
+    "a,b,c": _alpha_number,
+    "I,II,III": _roman_number,
+    "L0,L1,L2": lambda num: "L"+str(num),
+}
+
+
+def _axis_endpoints(distances, angles, length, limit=0):
+
+    """returns the start and end points of the axes segments as two (N,3) arrays.
+    If limit is not zero, each axis gives two segments of that length, one at
+    each end of the axis"""
+
+    dist = np.cumsum(np.asarray(distances, dtype=np.float64))
+    # axes usually share a few angles, compute sin/cos once per distinct angle
+    ang, inv = np.unique(np.asarray(angles, dtype=np.float64), return_inverse=True)
+    ang = np.radians(ang)
+    cos = np.cos(ang)[inv]
+    sin = np.sin(ang)[inv]
+    ln = np.where(np.abs(cos) < 0.01, 100 * length, length / np.where(cos == 0, 1, cos))
+    zeros = np.zeros_like(dist)
+    unitvecs = np.stack([sin, cos, zeros], axis=1)
+    p1s = np.stack([dist, zeros, zeros], axis=1)
+    p2s = p1s + unitvecs * ln[:, np.newaxis]
+    if limit:
+        p3s = unitvecs * limit
+        starts = np.stack([p1s, p2s], axis=1).reshape(-1, 3)
+        ends = np.stack([p1s + p3s, p2s - p3s], axis=1).reshape(-1, 3)
+        return starts, ends
+    return p1s, p2s
+
+
+# the bubbles drawn on each axis for each BubblePosition, as (start, arrow)
+# pairs: start is True for the bubble at the start of the axis, and arrow is
+# True or False for the side of an arrow or bar, or None for a circle
+_BUBBLE_POSITIONS = {
+    "Start": ((True,None),),
+    "End": ((False,None),),
+    "Both": ((True,None),(False,None)),
+    "None": (),
+    "Arrow left": ((True,True),(False,False)),
+    "Arrow right": ((True,False),(False,True)),
+    "Bar left": ((True,True),(False,False)),
+    "Bar right": ((True,False),(False,True)),
+}
+
+
+# angles of the points of a bubble circle, 32 segments, closed
+_CIRCLE_ANGLES = np.linspace(0, 2*np.pi, 33)
+
+
+def _transform_points(points, placement):
+
+    "returns the given points as a (N,3) array, transformed by the given placement"
+
+    mat = np.array(placement.toMatrix().A).reshape(4,4)
+    return np.array(points, dtype=np.float64).reshape(-1,3) @ mat[:3,:3].T + mat[:3,3]
+
+
 class _Axis:
 
     "The Axis object"
@@ -99,38 +191,37 @@ class _Axis:
 
         pl = obj.Placement
         geoms = []
-        dist = 0
         distances = [0]
         angles = [0]
+        limit = 0
         if hasattr(obj, "Distances"):
             distances = obj.Distances
         if hasattr(obj, "Angles"):
             angles = obj.Angles
+        if hasattr(obj,"Limit"):
+            limit = obj.Limit.Value
+        # don't rebuild the shape if none of its parameters changed and the
+        # object still holds the shape built from them. A moved shape is still
+        # a partner, a shape restored by undo or file loading is not
+        sig = (tuple(distances), tuple(angles), obj.Length.Value, limit)
+        last = getattr(self, "_last_shape", None)
+        if sig == getattr(self, "_last_sig", None) and last is not None and obj.Shape.isPartner(last):
+            return
         if distances and obj.Length.Value:
             if angles and len(distances) == len(angles):
-                for i in range(len(distances)):
-                    dist += distances[i]
-                    ang = math.radians(angles[i])
-                    ln = obj.Length.Value
-                    ln = 100 * ln if abs(math.cos(ang)) < 0.01 else ln / math.cos(ang)
-                    unitvec = Vector(math.sin(ang), math.cos(ang), 0)
-                    p1 = Vector(dist, 0, 0)
-                    p2 = p1 + unitvec * ln
-                    if hasattr(obj,"Limit") and obj.Limit.Value:
-                        p3 = unitvec * obj.Limit.Value
-                        p4 = unitvec * -obj.Limit.Value
-                        geoms.append(Part.LineSegment(p1, p1 + p3).toShape())
-                        geoms.append(Part.LineSegment(p2, p2 + p4).toShape())
-                    else:
-                        geoms.append(Part.LineSegment(p1, p2).toShape())
+                starts, ends = _axis_endpoints(distances, angles, obj.Length.Value, limit)
+                for p1, p2 in zip(starts.tolist(), ends.tolist()):
+                    geoms.append(Part.LineSegment(Vector(*p1), Vector(*p2)).toShape())
         if geoms:
             sh = Part.Compound(geoms)
             obj.Shape = sh
             obj.Placement = pl
+            self._last_sig = sig
+            self._last_shape = sh
 
     def onChanged(self,obj,prop):
 
-        if prop in ["Angles","Distances","Placement"]:
+        if prop in ["Angles","Distances"]:
             obj.touch()
 
     def dumps(self):
@@ -145,25 +236,15 @@ class _Axis:
 
         "returns the gridpoints of linked axes"
 
-        pts = []
-        for e in obj.Shape.Edges:
-            pts.append(e.Vertexes[0].Point)
-        return pts
+        return [e.Vertexes[0].Point for e in obj.Shape.Edges]
 
     def getAxisData(self,obj):
-        data = []
-        num = 0
-        for e in obj.Shape.Edges:
-            axdata = []
-            axdata.append(e.Vertexes[0].Point)
-            axdata.append(e.Vertexes[-1].Point)
-            if obj.ViewObject:
-                axdata.append(obj.ViewObject.Proxy.getNumber(obj.ViewObject,num))
-            else:
-                axdata.append(str(num))
-            data.append(axdata)
-            num += 1
-        return data
+        if obj.ViewObject:
+            getNumber = obj.ViewObject.Proxy.getNumber
+            return [[e.Vertexes[0].Point, e.Vertexes[-1].Point, getNumber(obj.ViewObject,num)]
+                    for num, e in enumerate(obj.Shape.Edges)]
+        return [[e.Vertexes[0].Point, e.Vertexes[-1].Point, str(num)]
+                for num, e in enumerate(obj.Shape.Edges)]
 
 
 class _ViewProviderAxis:
@@ -230,6 +311,7 @@ class _ViewProviderAxis:
         self.Object = vobj.Object
         self.bubbles = None
         self.bubbletexts = []
+        self.bubblecenters = np.empty((0,3))
         self.bubbledata = []
         sep = coin.SoSeparator()
         self.mat = coin.SoMaterial()
@@ -268,16 +350,18 @@ class _ViewProviderAxis:
         if prop == "Shape":
             if obj.Shape:
                 if obj.Shape.Edges:
-                    verts = []
+                    # transform all the vertices to local coordinates at once
+                    edgeverts = [e.Vertexes for e in obj.Shape.Edges]
+                    verts = _transform_points([tuple(v.Point) for ev in edgeverts for v in ev],
+                                              obj.Placement.inverse())
                     vset = []
                     i = 0
-                    for e in obj.Shape.Edges:
-                        for v in e.Vertexes:
-                            verts.append(tuple(obj.Placement.inverse().multVec(v.Point)))
-                            vset.append(i)
-                            i += 1
+                    for ev in edgeverts:
+                        k = len(ev)
+                        vset.extend(range(i, i+k))
                         vset.append(-1)
-                    self.linecoords.point.setValues(verts)
+                        i += k
+                    self.linecoords.point.setValues(verts.tolist())
                     self.lineset.coordIndex.setValues(0,len(vset),vset)
                     self.lineset.coordIndex.setNum(len(vset))
         elif prop in ["Placement", "Length"] and not hasattr(obj, "Distances"):
@@ -329,149 +413,134 @@ class _ViewProviderAxis:
                     self.bubbleset.removeChild(self.bubbles)
                     self.bubbles = None
                 if vobj.Object.Shape:
-                    if vobj.Object.Shape.Edges:
+                    edges = vobj.Object.Shape.Edges
+                    if edges:
                         self.bubbles = coin.SoSeparator()
                         self.bubblestyle = coin.SoDrawStyle()
                         self.bubblestyle.linePattern = 0xffff
                         self.bubbles.addChild(self.bubblestyle)
                         self.bubbletexts = []
                         self.bubbledata = []
-                        pos = ["Start"]
-                        if hasattr(vobj,"BubblePosition"):
-                            if vobj.BubblePosition in ["Both","Arrow left","Arrow right","Bar left","Bar right"]:
-                                pos = ["Start","End"]
-                            elif vobj.BubblePosition == "None":
-                                pos = []
-                            else:
-                                pos = [vobj.BubblePosition]
-                        e = len(vobj.Object.Shape.Edges)
-                        if getattr(vobj.Object,"Limit",0):
+                        centers = []
+                        has_limit = bool(getattr(vobj.Object,"Limit",0))
+                        e = len(edges)
+                        if has_limit:
                             e //= 2
                         n = len(getattr(vobj.Object,"Distances",[]))
+                        obj_pl = vobj.Object.Placement
+                        inv = obj_pl.inverse()
+                        normal = obj_pl.Rotation.multVec(Vector(0,0,1))
+                        bpos = getattr(vobj,"BubblePosition","Start")
+                        pos = _BUBBLE_POSITIONS.get(bpos,_BUBBLE_POSITIONS["Start"])
+                        starts_arrow = bpos.startswith("Arrow")
+                        if hasattr(vobj.BubbleSize,"Value"):
+                            rad = vobj.BubbleSize.Value/2
+                        else:
+                            rad = vobj.BubbleSize/2
+                        fs = rad*1.5
+                        if hasattr(vobj,"FontSize"):
+                            fs = vobj.FontSize.Value
+                        fn = params.get_param("textfont")
+                        if hasattr(vobj,"FontName"):
+                            if vobj.FontName:
+                                try:
+                                    fn = str(vobj.FontName)
+                                except Exception:
+                                    pass
                         for i in range(min(e,n)):
-                            for p in pos:
-                                if getattr(vobj.Object,"Limit",0):
-                                    verts = [vobj.Object.Placement.inverse().multVec(vobj.Object.Shape.Edges[i*2].Vertexes[0].Point),
-                                             vobj.Object.Placement.inverse().multVec(vobj.Object.Shape.Edges[i*2+1].Vertexes[0].Point)]
-                                else:
-                                    verts = [vobj.Object.Placement.inverse().multVec(v.Point) for v in vobj.Object.Shape.Edges[i].Vertexes]
-                                arrow = None
-                                if p == "Start":
+                            if has_limit:
+                                verts = [inv.multVec(edges[i*2].Vertexes[0].Point),
+                                         inv.multVec(edges[i*2+1].Vertexes[0].Point)]
+                            else:
+                                verts = [inv.multVec(v.Point) for v in edges[i].Vertexes]
+                            for start, arrow in pos:
+                                if start:
                                     p1 = verts[0]
                                     p2 = verts[1]
-                                    if vobj.BubblePosition.endswith("left"):
-                                        arrow = True
-                                    elif vobj.BubblePosition.endswith("right"):
-                                        arrow = False
                                 else:
                                     p1 = verts[1]
                                     p2 = verts[0]
-                                    if vobj.BubblePosition.endswith("left"):
-                                        arrow = False
-                                    elif vobj.BubblePosition.endswith("right"):
-                                        arrow = True
                                 dv = p2.sub(p1)
                                 dv.normalize()
-                                if hasattr(vobj.BubbleSize,"Value"):
-                                    rad = vobj.BubbleSize.Value/2
-                                else:
-                                    rad = vobj.BubbleSize/2
-                                center = p2.add(Vector(dv).multiply(rad))
-                                normal = vobj.Object.Placement.Rotation.multVec(Vector(0,0,1))
-                                chord = dv.cross(normal)
+                                dvr = dv * rad
+                                center = p2 + dvr
+                                chordr = dv.cross(normal) * rad
                                 if arrow:
-                                    p3 = p2.add(Vector(chord).multiply(rad/2).negative())
-                                    if vobj.BubblePosition.startswith("Arrow"):
-                                        p4 = p3.add(Vector(dv).multiply(rad*2).negative())
-                                        p5 = p2.add(Vector(dv).multiply(rad).negative()).add(Vector(chord).multiply(rad*1.5).negative())
+                                    p3 = p2 - chordr * 0.5
+                                    if starts_arrow:
+                                        p4 = p3 - dvr * 2
+                                        p5 = p2 - dvr - chordr * 1.5
                                         pts = [tuple(p3),tuple(p5),tuple(p4),tuple(p3)]
-                                        center = p5.add(Vector(chord).multiply(rad*2.5))
+                                        center = p5 + chordr * 2.5
                                     else:
-                                        p4 = p3.add(Vector(dv).multiply(rad/2).negative())
-                                        p5 = p4.add(Vector(chord).multiply(rad*1.5).negative())
-                                        p6 = p5.add(Vector(dv).multiply(rad/2))
+                                        p4 = p3 - dvr * 0.5
+                                        p5 = p4 - chordr * 1.5
+                                        p6 = p5 + dvr * 0.5
                                         pts = [tuple(p3),tuple(p6),tuple(p5),tuple(p4),tuple(p3)]
-                                        center = p5.add(Vector(chord).multiply(rad*3))
+                                        center = p5 + chordr * 3
                                     coords = coin.SoCoordinate3()
                                     coords.point.setValues(0,len(pts),pts)
                                     line = coin.SoFaceSet()
                                     line.numVertices.setValue(-1)
                                     cir = Part.makePolygon(pts)
-                                    cir.Placement = vobj.Object.Placement
+                                    cir.Placement = obj_pl
                                     self.bubbledata.append(cir)
                                 elif arrow == False:
-                                    p3 = p2.add(Vector(chord).multiply(rad/2))
-                                    if vobj.BubblePosition.startswith("Arrow"):
-                                        p4 = p3.add(Vector(dv).multiply(rad*2).negative())
-                                        p5 = p2.add(Vector(dv).multiply(rad).negative()).add(Vector(chord).multiply(rad*1.5))
+                                    p3 = p2 + chordr * 0.5
+                                    if starts_arrow:
+                                        p4 = p3 - dvr * 2
+                                        p5 = p2 - dvr + chordr * 1.5
                                         pts = [tuple(p3),tuple(p4),tuple(p5),tuple(p3)]
-                                        center = p5.add(Vector(chord).multiply(rad*2.5).negative())
+                                        center = p5 - chordr * 2.5
                                     else:
-                                        p4 = p3.add(Vector(dv).multiply(rad/2).negative())
-                                        p5 = p4.add(Vector(chord).multiply(rad*1.5))
-                                        p6 = p5.add(Vector(dv).multiply(rad/2))
+                                        p4 = p3 - dvr * 0.5
+                                        p5 = p4 + chordr * 1.5
+                                        p6 = p5 + dvr * 0.5
                                         pts = [tuple(p3),tuple(p4),tuple(p5),tuple(p6),tuple(p3)]
-                                        center = p5.add(Vector(chord).multiply(rad*3).negative())
+                                        center = p5 - chordr * 3
                                     coords = coin.SoCoordinate3()
                                     coords.point.setValues(0,len(pts),pts)
                                     line = coin.SoFaceSet()
                                     line.numVertices.setValue(-1)
                                     cir = Part.makePolygon(pts)
-                                    cir.Placement = vobj.Object.Placement
+                                    cir.Placement = obj_pl
                                     self.bubbledata.append(cir)
                                 else:
+                                    pc = np.empty((len(_CIRCLE_ANGLES),3))
+                                    pc[:,0] = center.x + rad*np.cos(_CIRCLE_ANGLES)
+                                    pc[:,1] = center.y + rad*np.sin(_CIRCLE_ANGLES)
+                                    pc[:,2] = center.z
+                                    coords = coin.SoCoordinate3()
+                                    coords.point.setValues(0,len(pc),pc.tolist())
+                                    line = coin.SoLineSet()
+                                    line.numVertices.setValue(-1)
+                                    # the circle shape is used by getShapeData() for exporting
                                     cir = Part.makeCircle(rad,center)
-                                    buf = cir.writeInventor()
-                                    try:
-                                        cin = coin.SoInput()
-                                        cin.setBuffer(buf)
-                                        cob = coin.SoDB.readAll(cin)
-                                    except Exception:
-                                        # workaround for pivy SoInput.setBuffer() bug
-                                        buf = buf.replace("\n","")
-                                        pts = re.findall(r"point \[(.*?)\]",buf)[0]
-                                        pts = pts.split(",")
-                                        pc = []
-                                        for point in pts:
-                                            v = point.strip().split()
-                                            pc.append([float(v[0]),float(v[1]),float(v[2])])
-                                        coords = coin.SoCoordinate3()
-                                        coords.point.setValues(0,len(pc),pc)
-                                        line = coin.SoLineSet()
-                                        line.numVertices.setValue(-1)
-                                    else:
-                                        coords = cob.getChild(1).getChild(0).getChild(2)
-                                        line = cob.getChild(1).getChild(0).getChild(3)
-                                    cir.Placement = vobj.Object.Placement
+                                    cir.Placement = obj_pl
                                     self.bubbledata.append(cir)
                                 self.bubbles.addChild(coords)
                                 self.bubbles.addChild(line)
                                 st = coin.SoSeparator()
                                 tr = coin.SoTransform()
-                                fs = rad*1.5
-                                if hasattr(vobj,"FontSize"):
-                                    fs = vobj.FontSize.Value
                                 txpos = FreeCAD.Vector(center.x,center.y-fs/2.5,center.z)
                                 tr.translation.setValue(tuple(txpos))
                                 fo = coin.SoFont()
-                                fn = params.get_param("textfont")
-                                if hasattr(vobj,"FontName"):
-                                    if vobj.FontName:
-                                        try:
-                                            fn = str(vobj.FontName)
-                                        except Exception:
-                                            pass
                                 fo.name = fn
                                 fo.size = fs
                                 tx = coin.SoAsciiText()
                                 tx.justification = coin.SoText2.CENTER
-                                self.bubbletexts.append((tx,vobj.Object.Placement.multVec(center)))
+                                self.bubbletexts.append(tx)
+                                centers.append(tuple(center))
                                 st.addChild(tr)
                                 st.addChild(fo)
                                 st.addChild(tx)
                                 self.bubbles.addChild(st)
-                        self.bubbleset.addChild(self.bubbles)
+                        # bubble centers in global coordinates, parallel to self.bubbletexts
+                        self.bubblecenters = _transform_points(centers,obj_pl)
+                        # number the bubbles before attaching them, so the whole
+                        # bubble tree reaches the scene graph in a single change
                         self.onChanged(vobj,"NumberingStyle")
+                        self.bubbleset.addChild(self.bubbles)
             if prop in ["FontName","FontSize"]:
                 self.onChanged(vobj,"ShowLabel")
         elif prop in ["NumberingStyle","StartNumber"]:
@@ -480,15 +549,14 @@ class _ViewProviderAxis:
                 if hasattr(vobj,"StartNumber"):
                     if vobj.StartNumber > 1:
                         num = vobj.StartNumber-1
-                alt = False
-                for t in self.bubbletexts:
-                    t[0].string = self.getNumber(vobj,num)
-                    num += 1
-                    if hasattr(vobj,"BubblePosition"):
-                        if vobj.BubblePosition in ["Both","Arrow left","Arrow right","Bar left","Bar right"]:
-                            if not alt:
-                                num -= 1
-                    alt = not alt
+                # with bubbles at both ends, each axis has two bubbles with the same number
+                step = 1
+                if hasattr(vobj,"BubblePosition"):
+                    if len(_BUBBLE_POSITIONS.get(vobj.BubblePosition,())) == 2:
+                        step = 2
+                numbers = [self.getNumber(vobj,num+i) for i in range((len(self.bubbletexts)+step-1)//step)]
+                for i,t in enumerate(self.bubbletexts):
+                    t.string = numbers[i//step]
         elif prop in ["ShowLabel", "LabelOffset"]:
             if hasattr(self,"labels"):
                 if self.labels:
@@ -497,39 +565,44 @@ class _ViewProviderAxis:
             if hasattr(vobj,"ShowLabel") and hasattr(vobj.Object,"Labels"):
                 if vobj.ShowLabel:
                     self.labels = coin.SoSeparator()
-                    if hasattr(vobj.Object,"Limit") and vobj.Object.Limit.Value:
-                        n = len(vobj.Object.Shape.Edges)/2
+                    edges = vobj.Object.Shape.Edges
+                    labels = vobj.Object.Labels
+                    has_limit = hasattr(vobj.Object,"Limit") and bool(vobj.Object.Limit.Value)
+                    if has_limit:
+                        n = len(edges)//2
+                    else:
+                        n = len(edges)
+                    if hasattr(vobj,"LabelOffset"):
+                        pl = FreeCAD.Placement(vobj.LabelOffset)
                     else:
-                        n = len(vobj.Object.Shape.Edges)
+                        pl = FreeCAD.Placement()
+                    rot = pl.Rotation.Q
+                    if hasattr(vobj,"FontSize"):
+                        fs = vobj.FontSize.Value
+                    elif hasattr(vobj.BubbleSize,"Value"):
+                        fs = vobj.BubbleSize.Value*0.75
+                    else:
+                        fs = vobj.BubbleSize*0.75
+                    fn = params.get_param("textfont")
+                    if hasattr(vobj,"FontName"):
+                        if vobj.FontName:
+                            try:
+                                fn = str(vobj.FontName)
+                            except Exception:
+                                pass
                     for i in range(n):
-                        if len(vobj.Object.Labels) > i:
-                            if vobj.Object.Labels[i]:
-                                vert = vobj.Object.Shape.Edges[i].Vertexes[0].Point
-                                if hasattr(vobj,"LabelOffset"):
-                                    pl = FreeCAD.Placement(vobj.LabelOffset)
-                                    pl.Base = vert.add(pl.Base)
+                        if len(labels) > i:
+                            if labels[i]:
+                                edge = edges[i*2] if has_limit else edges[i]
+                                vert = edge.Vertexes[0].Point
                                 st = coin.SoSeparator()
                                 tr = coin.SoTransform()
                                 fo = coin.SoFont()
                                 tx = coin.SoAsciiText()
                                 tx.justification = coin.SoText2.LEFT
-                                t = vobj.Object.Labels[i]
-                                tx.string.setValue(t)
-                                if hasattr(vobj,"FontSize"):
-                                    fs = vobj.FontSize.Value
-                                elif hasattr(vobj.BubbleSize,"Value"):
-                                    fs = vobj.BubbleSize.Value*0.75
-                                else:
-                                    fs = vobj.BubbleSize*0.75
-                                tr.translation.setValue(tuple(pl.Base))
-                                tr.rotation.setValue(pl.Rotation.Q)
-                                fn = params.get_param("textfont")
-                                if hasattr(vobj,"FontName"):
-                                    if vobj.FontName:
-                                        try:
-                                            fn = str(vobj.FontName)
-                                        except Exception:
-                                            pass
+                                tx.string.setValue(labels[i])
+                                tr.translation.setValue(tuple(vert.add(pl.Base)))
+                                tr.rotation.setValue(rot)
                                 fo.name = fn
                                 fo.size = fs
                                 st.addChild(tr)
@@ -540,52 +613,17 @@ class _ViewProviderAxis:
 
     def getNumber(self,vobj,num):
 
-        chars = "abcdefghijklmnopqrstuvwxyz"
-        roman=(('M',1000),('CM',900),('D',500),('CD',400),
-               ('C',100),('XC',90),('L',50),('XL',40),
-               ('X',10),('IX',9),('V',5),('IV',4),('I',1))
         if hasattr(vobj.Object,"CustomNumber") and vobj.Object.CustomNumber:
             return vobj.Object.CustomNumber
         elif hasattr(vobj,"NumberingStyle"):
-            if vobj.NumberingStyle == "1,2,3":
-                return str(num+1)
-            elif vobj.NumberingStyle == "01,02,03":
-                return str(num+1).zfill(2)
-            elif vobj.NumberingStyle == "001,002,003":
-                return str(num+1).zfill(3)
-            elif vobj.NumberingStyle == "A,B,C":
-                result = ""
-                base = num//26
-                if base:
-                    result += chars[base].upper()
-                remainder = num % 26
-                result += chars[remainder].upper()
-                return result
-            elif vobj.NumberingStyle == "a,b,c":
-                result = ""
-                base = num//26
-                if base:
-                    result += chars[base]
-                remainder = num % 26
-                result += chars[remainder]
-                return result
-            elif vobj.NumberingStyle == "I,II,III":
-                result = ""
-                n = num
-                n += 1
-                for numeral, integer in roman:
-                    while n >= integer:
-                        result += numeral
-                        n -= integer
-                return result
-            elif vobj.NumberingStyle == "L0,L1,L2":
-                return "L"+str(num)
+            if vobj.NumberingStyle in _NUMBERING:
+                return _NUMBERING[vobj.NumberingStyle](num)
         else:
             return str(num+1)
 
     def getTextData(self):
 
-        return [(t[0].string.getValues()[0],t[1]) for t in self.bubbletexts]
+        return [(t.string.getValues()[0],Vector(*c)) for t,c in zip(self.bubbletexts,self.bubblecenters.tolist())]
 
     def getShapeData(self):
 
@@ -597,7 +635,6 @@ class _ViewProviderAxis:
 
         taskd = _AxisTaskPanel()
         taskd.obj = vobj.Object
-        taskd.update()
         FreeCADGui.Control.showDialog(taskd)
         return True
 
@@ -613,9 +650,7 @@ class _ViewProviderAxis:
             return
         actionEdit = QtGui.QAction(translate("Arch", "Edit"),
                                    menu)
-        QtCore.QObject.connect(actionEdit,
-                               QtCore.SIGNAL("triggered()"),
-                               self.edit)
+        actionEdit.triggered.connect(self.edit)
         menu.addAction(actionEdit)
 
         # The default Part::FeaturePython context menu contains a `Set colors`
@@ -625,9 +660,7 @@ class _ViewProviderAxis:
         action_transform = QtGui.QAction(FreeCADGui.getIcon("Std_TransformManip.svg"),
                                          translate("Command", "Transform"), # Context `Command` instead of `Arch`.
                                          menu)
-        QtCore.QObject.connect(action_transform,
-                               QtCore.SIGNAL("triggered()"),
-                               self.transform)
+        action_transform.triggered.connect(self.transform)
         menu.addAction(action_transform)
 
         return True
@@ -647,21 +680,78 @@ class _ViewProviderAxis:
         return None
 
 
+if FreeCAD.GuiUp:
+
+    # the task panel button icons, loaded on first use
+    _ADD_ICON = None
+    _DEL_ICON = None
+
+    class _AxisValueDelegate(QtGui.QStyledItemDelegate):
+
+        "edits the distance and angle cells with a spinbox, storing floats"
+
+        def createEditor(self,parent,option,index):
+            editor = QtGui.QDoubleSpinBox(parent)
+            editor.setDecimals(params.get_param("Decimals",path="Units"))
+            editor.setRange(-1e9,1e9)
+            # any typing marks the editor, even if it ends on the same text
+            editor.textChanged.connect(lambda text: editor.setProperty("modified",True))
+            return editor
+
+        def setEditorData(self,editor,index):
+            value = index.data(QtCore.Qt.UserRole)
+            editor.blockSignals(True)
+            editor.setValue(value if value is not None else 0.0)
+            editor.blockSignals(False)
+            editor.setProperty("modified",False)
+
+        def setModelData(self,editor,model,index):
+            if not editor.property("modified"):
+                # untouched, keep the stored value with its full precision
+                return
+            editor.interpretText()
+            value = editor.value()
+            model.setData(index,value,QtCore.Qt.UserRole)
+            model.setData(index,str(value),QtCore.Qt.DisplayRole)
+
+
 class _AxisTaskPanel:
 
     '''The editmode TaskPanel for Axis objects'''
 
+    # the translated texts of the panel, per language
+    textCache = {}
+
     def __init__(self):
 
+        # the widgets are only built when the task dialog asks for the form
+        self.obj = None
+        self._form = None
+
+    @property
+    def form(self):
+
+        "the panel widget, built on first access"
+
+        if self._form is None:
+            self.setupUi()
+        return self._form
+
+    def setupUi(self):
+
         # the panel has a tree widget that contains categories
         # for the subcomponents, such as additions, subtractions.
         # the categories are shown only if they are not empty.
 
-        self.updating = False
+        global _ADD_ICON, _DEL_ICON
+        if _ADD_ICON is None:
+            _ADD_ICON = QtGui.QIcon(":/icons/Arch_Add.svg")
+            _DEL_ICON = QtGui.QIcon(":/icons/Arch_Remove.svg")
 
-        self.obj = None
-        self.form = QtGui.QWidget()
+        self._form = QtGui.QWidget()
         self.form.setObjectName("TaskPanel")
+        # don't lay out and paint the form until all its widgets are in place
+        self.form.setUpdatesEnabled(False)
         self.grid = QtGui.QGridLayout(self.form)
         self.grid.setObjectName("grid")
         self.title = QtGui.QLabel(self.form)
@@ -671,27 +761,45 @@ class _AxisTaskPanel:
         self.tree = QtGui.QTreeWidget(self.form)
         self.grid.addWidget(self.tree, 1, 0, 1, 2)
         self.tree.setColumnCount(4)
-        self.tree.header().resizeSection(0,50)
-        self.tree.header().resizeSection(1,80)
-        self.tree.header().resizeSection(2,60)
+        self.tree.setUniformRowHeights(True)
+        # all the rows share the same flags
+        self.itemFlags = QtCore.Qt.ItemIsSelectable | QtCore.Qt.ItemIsEditable | QtCore.Qt.ItemIsEnabled
+        header = self.tree.header()
+        header.setSectionResizeMode(QtGui.QHeaderView.Interactive)
+        header.setDefaultSectionSize(80)
+        header.resizeSection(0,50)
+        header.resizeSection(2,60)
 
         # buttons
         self.addButton = QtGui.QPushButton(self.form)
         self.addButton.setObjectName("addButton")
-        self.addButton.setIcon(QtGui.QIcon(":/icons/Arch_Add.svg"))
+        self.addButton.setIcon(_ADD_ICON)
         self.grid.addWidget(self.addButton, 3, 0, 1, 1)
         self.addButton.setEnabled(True)
 
         self.delButton = QtGui.QPushButton(self.form)
         self.delButton.setObjectName("delButton")
-        self.delButton.setIcon(QtGui.QIcon(":/icons/Arch_Remove.svg"))
+        self.delButton.setIcon(_DEL_ICON)
         self.grid.addWidget(self.delButton, 3, 1, 1, 1)
         self.delButton.setEnabled(True)
 
-        QtCore.QObject.connect(self.addButton, QtCore.SIGNAL("clicked()"), self.addElement)
-        QtCore.QObject.connect(self.delButton, QtCore.SIGNAL("clicked()"), self.removeElement)
-        QtCore.QObject.connect(self.tree, QtCore.SIGNAL("itemChanged(QTreeWidgetItem *, int)"), self.edit)
+        self.addButton.clicked.connect(self.addElement)
+        self.delButton.clicked.connect(self.removeElement)
+        self.tree.itemChanged.connect(self.edit)
+        # distances and angles are typed in a spinbox, so they are always valid
+        self.valueDelegate = _AxisValueDelegate(self.tree)
+        self.tree.setItemDelegateForColumn(1,self.valueDelegate)
+        self.tree.setItemDelegateForColumn(2,self.valueDelegate)
+
+        # edits are transferred to the object after a short pause, and the
+        # document is recomputed only when the panel is closed
+        self.editTimer = QtCore.QTimer(self.form)
+        self.editTimer.setSingleShot(True)
+        self.editTimer.setInterval(300)
+        self.editTimer.timeout.connect(self.commitEdits)
         self.update()
+        self.retranslateUi(self.form)
+        self.form.setUpdatesEnabled(True)
 
     def isAllowedAlterSelection(self):
 
@@ -708,84 +816,134 @@ class _AxisTaskPanel:
     def update(self):
 
         'fills the treewidget'
-        self.updating = True
+        if self._form is None:
+            # setupUi() fills the tree once the widgets are built
+            return
+        # tree signals are blocked while filling, so edit() is not triggered
+        self.tree.setUpdatesEnabled(False)
+        self.tree.blockSignals(True)
         self.tree.clear()
         if self.obj and hasattr(self.obj, "Distances"):
-            for i in range(len(self.obj.Distances)):
-                item = QtGui.QTreeWidgetItem(self.tree)
+            labels = self.obj.Labels if hasattr(self.obj,"Labels") else []
+            # missing angles or labels give empty cells
+            rows = zip_longest(self.obj.Distances,self.obj.Angles,labels,fillvalue="")
+            # build the items detached and insert them all at once
+            items = []
+            for i,(dv,av,lv) in enumerate(islice(rows,len(self.obj.Distances))):
+                item = QtGui.QTreeWidgetItem()
                 item.setText(0,str(i+1))
-                if len(self.obj.Distances) > i:
-                    item.setText(1,str(self.obj.Distances[i]))
-                if len(self.obj.Angles) > i:
-                    item.setText(2,str(self.obj.Angles[i]))
-                if hasattr(self.obj,"Labels"):
-                    if len(self.obj.Labels) > i:
-                        item.setText(3,str(self.obj.Labels[i]))
-                item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
+                item.setText(1,str(dv))
+                item.setText(2,str(av))
+                item.setText(3,str(lv))
+                # keep the raw values, so they don't need to be parsed back
+                item.setData(1,QtCore.Qt.UserRole,dv if dv != "" else None)
+                item.setData(2,QtCore.Qt.UserRole,av if av != "" else None)
+                item.setFlags(self.itemFlags)
                 item.setTextAlignment(0,QtCore.Qt.AlignLeft)
-        self.retranslateUi(self.form)
-        self.updating = False
+                items.append(item)
+            self.tree.addTopLevelItems(items)
+        self.tree.blockSignals(False)
+        self.tree.setUpdatesEnabled(True)
 
     def addElement(self):
 
-        item = QtGui.QTreeWidgetItem(self.tree)
-        item.setText(0,str(self.tree.topLevelItemCount()))
+        item = QtGui.QTreeWidgetItem()
+        item.setText(0,str(self.tree.topLevelItemCount()+1))
         item.setText(1,"1.0")
         item.setText(2,"0.0")
-        item.setFlags(item.flags() | QtCore.Qt.ItemIsEditable)
+        item.setData(1,QtCore.Qt.UserRole,1.0)
+        item.setData(2,QtCore.Qt.UserRole,0.0)
+        item.setFlags(self.itemFlags)
+        self.tree.addTopLevelItem(item)
         self.resetObject()
 
     def removeElement(self):
 
         it = self.tree.currentItem()
         if it:
-            nr = int(it.text(0))-1
-            self.resetObject(remove=nr)
-            self.update()
+            # remove the row and renumber the following ones in place
+            nr = self.tree.indexOfTopLevelItem(it)
+            self.tree.blockSignals(True)
+            self.tree.takeTopLevelItem(nr)
+            for i in range(nr,self.tree.topLevelItemCount()):
+                self.tree.topLevelItem(i).setText(0,str(i+1))
+            self.tree.blockSignals(False)
+            self.resetObject()
 
     def edit(self,item,column):
 
-        if not self.updating:
-            self.resetObject()
+        self.editTimer.start()
+
+    def getValue(self,item,column):
+
+        "returns the float value stored in a cell, 0 if it is empty"
+
+        value = item.data(column,QtCore.Qt.UserRole)
+        return value if value is not None else 0.0
+
+    def commitEdits(self):
 
-    def resetObject(self,remove=None):
+        "transfers pending edits to the object, without recomputing"
+
+        self.resetObject(recompute=False)
+
+    def resetObject(self,recompute=True):
 
         "transfers the values from the widget to the object"
 
-        d = []
-        a = []
-        l = []
-        for i in range(self.tree.topLevelItemCount()):
-            it = self.tree.findItems(str(i+1),QtCore.Qt.MatchExactly,0)[0]
-            if (remove is None) or (remove != i):
-                if it.text(1):
-                    d.append(float(it.text(1)))
-                else:
-                    d.append(0.0)
-                if it.text(2):
-                    a.append(float(it.text(2)))
-                else:
-                    a.append(0.0)
-                l.append(it.text(3))
-        self.obj.Distances = d
-        self.obj.Angles = a
-        self.obj.Labels = l
+        # this transfers all rows, including any pending edit
+        self.editTimer.stop()
+        tree = self.tree
+        items = [tree.topLevelItem(i) for i in range(tree.topLevelItemCount())]
+        d = [self.getValue(it,1) for it in items]
+        a = [self.getValue(it,2) for it in items]
+        l = [it.text(3) for it in items]
+        # only write the lists that actually changed
+        changed = False
+        if d != list(self.obj.Distances):
+            self.obj.Distances = d
+            changed = True
+        if a != list(self.obj.Angles):
+            self.obj.Angles = a
+            changed = True
+        if l != list(self.obj.Labels):
+            self.obj.Labels = l
+            changed = True
+        if not changed:
+            return
         self.obj.touch()
-        FreeCAD.ActiveDocument.recompute()
+        if recompute:
+            FreeCAD.ActiveDocument.recompute([self.obj])
 
     def reject(self):
 
+        if self._form is not None and self.editTimer.isActive():
+            self.commitEdits()
         FreeCAD.ActiveDocument.recompute()
         FreeCADGui.ActiveDocument.resetEdit()
         return True
 
+    def getTexts(self):
+
+        "returns the translated texts of the panel, cached per language"
+
+        lang = FreeCADGui.getLocale()
+        if not lang in self.textCache:
+            self.textCache[lang] = (QtGui.QApplication.translate("Arch", "Axes", None),
+                                    QtGui.QApplication.translate("Arch", "Remove", None),
+                                    QtGui.QApplication.translate("Arch", "Add", None),
+                                    QtGui.QApplication.translate("Arch", "Distances (mm) and angles (deg) between axes", None),
+                                    [QtGui.QApplication.translate("Arch", "Axis", None),
+                                     QtGui.QApplication.translate("Arch", "Distance", None),
+                                     QtGui.QApplication.translate("Arch", "Angle", None),
+                                     QtGui.QApplication.translate("Arch", "Label", None)])
+        return self.textCache[lang]
+
     def retranslateUi(self, TaskPanel):
 
-        TaskPanel.setWindowTitle(QtGui.QApplication.translate("Arch", "Axes", None))
-        self.delButton.setText(QtGui.QApplication.translate("Arch", "Remove", None))
-        self.addButton.setText(QtGui.QApplication.translate("Arch", "Add", None))
-        self.title.setText(QtGui.QApplication.translate("Arch", "Distances (mm) and angles (deg) between axes", None))
-        self.tree.setHeaderLabels([QtGui.QApplication.translate("Arch", "Axis", None),
-                                   QtGui.QApplication.translate("Arch", "Distance", None),
-                                   QtGui.QApplication.translate("Arch", "Angle", None),
-                                   QtGui.QApplication.translate("Arch", "Label", None)])
+        title, remove, add, label, headers = self.getTexts()
+        TaskPanel.setWindowTitle(title)
+        self.delButton.setText(remove)
+        self.addButton.setText(add)
+        self.title.setText(label)
+        self.tree.setHeaderLabels(headers)
@@ -22,6 +22,8 @@
 # *                                                                         *
 # ***************************************************************************
 
+import math
+
 import FreeCAD as App
 import Arch
 from bimtests import TestArchBase
@@ -59,4 +61,87 @@ class TestArchAxis(TestArchBase.TestArchBase):
         axis2 = Arch.makeAxis(num=1, size=2000)
         axis_system = Arch.makeAxisSystem([axis1, axis2], name="TestAxisSystem")
         self.assertIsNotNone(axis_system, "makeAxisSystem failed to create an axis system.")
-        self.assertEqual(axis_system.Label, "TestAxisSystem", "Axis system label is incorrect.")
\ No newline at end of file
+        self.assertEqual(axis_system.Label, "TestAxisSystem", "Axis system label is incorrect.")
+
+    def test_axis_shape_update(self):
+        """Test that the axis shape follows changes of its parameters."""
+        operation = "Testing axis shape update"
+        self.printTestMessage(operation)
+
+        axis = Arch.makeAxis(num=3, size=1000)
+        self.assertEqual(len(axis.Shape.Edges), 3, "Incorrect number of edges")
+        axis.Distances = [0, 1000, 1000, 2000]
+        axis.Angles = [0, 0, 0, 0]
+        App.ActiveDocument.recompute()
+        self.assertEqual(len(axis.Shape.Edges), 4, "Shape not rebuilt after changing distances")
+        axis.Limit = 500
+        App.ActiveDocument.recompute()
+        self.assertEqual(len(axis.Shape.Edges), 8, "Shape not rebuilt after changing limit")
+        self.assertAlmostEqual(axis.Shape.Edges[0].Length, 500, 6, "Incorrect limited axis length")
+
+    def test_axis_shape_angles(self):
+        """Test the axis end points with mixed angles, with and without limit."""
+        operation = "Testing axis shape with mixed angles"
+        self.printTestMessage(operation)
+
+        axis = Arch.makeAxis(num=4, size=1000)
+        axis.Length = 1000
+        axis.Distances = [0, 1000, 1000, 2000]
+        axis.Angles = [0, 30, 0, 90]
+        App.ActiveDocument.recompute()
+        # axes at 90 degrees can't reach the length, they are 100 times longer
+        tan30 = 1000 * math.tan(math.radians(30))
+        expected = [((0, 0), (0, 1000)),
+                    ((1000, 0), (1000 + tan30, 1000)),
+                    ((2000, 0), (2000, 1000)),
+                    ((4000, 0), (104000, 0))]
+        self.assertEqual(len(axis.Shape.Edges), 4, "Incorrect number of edges")
+        for edge, (start, end) in zip(axis.Shape.Edges, expected):
+            self.assertAlmostEqual(edge.Vertexes[0].Point.distanceToPoint(App.Vector(*start, 0)), 0, 6, "Incorrect axis start")
+            self.assertAlmostEqual(edge.Vertexes[1].Point.distanceToPoint(App.Vector(*end, 0)), 0, 6, "Incorrect axis end")
+
+        axis.Limit = 200
+        App.ActiveDocument.recompute()
+        sin30 = 200 * math.sin(math.radians(30))
+        cos30 = 200 * math.cos(math.radians(30))
+        expected = [((0, 0), (0, 200)), ((0, 1000), (0, 800)),
+                    ((1000, 0), (1000 + sin30, cos30)), ((1000 + tan30, 1000), (1000 + tan30 - sin30, 1000 - cos30)),
+                    ((2000, 0), (2000, 200)), ((2000, 1000), (2000, 800)),
+                    ((4000, 0), (4200, 0)), ((104000, 0), (103800, 0))]
+        self.assertEqual(len(axis.Shape.Edges), 8, "Incorrect number of limited edges")
+        for edge, (start, end) in zip(axis.Shape.Edges, expected):
+            self.assertAlmostEqual(edge.Vertexes[0].Point.distanceToPoint(App.Vector(*start, 0)), 0, 6, "Incorrect limited axis start")
+            self.assertAlmostEqual(edge.Vertexes[1].Point.distanceToPoint(App.Vector(*end, 0)), 0, 6, "Incorrect limited axis end")
+
+    def test_axis_shape_after_undo(self):
+        """Test that the axis shape is rebuilt after undoing a change."""
+        operation = "Testing axis shape after undo"
+        self.printTestMessage(operation)
+
+        doc = self.document
+        doc.UndoMode = 1
+        axis = Arch.makeAxis(num=2, size=1000)
+        doc.recompute()
+        doc.openTransaction("Change distances")
+        axis.Distances = [0, 2000]
+        doc.recompute()
+        doc.commitTransaction()
+        doc.undo()
+        self.assertAlmostEqual(axis.Shape.Edges[1].Vertexes[0].Point.x, 1000, 6, "Shape not restored by undo")
+        axis.Distances = [0, 2000]
+        doc.recompute()
+        self.assertAlmostEqual(axis.Shape.Edges[1].Vertexes[0].Point.x, 2000, 6, "Shape not rebuilt after undo")
+
+    def test_axis_placement_update(self):
+        """Test that moving an axis moves its shape."""
+        operation = "Testing axis placement update"
+        self.printTestMessage(operation)
+
+        axis = Arch.makeAxis(num=2, size=1000)
+        App.ActiveDocument.recompute()
+        edge = axis.Shape.Edges[0]
+        axis.Placement = App.Placement(App.Vector(0, 0, 500), App.Rotation())
+        App.ActiveDocument.recompute()
+        self.assertEqual(len(axis.Shape.Edges), 2, "Incorrect number of edges")
+        self.assertAlmostEqual(axis.Shape.Edges[0].Vertexes[0].Point.z, 500, 6, "Shape did not follow the placement")
+        self.assertTrue(axis.Shape.Edges[0].isPartner(edge), "Shape rebuilt after moving the axis")